@@ -3,6 +3,7 @@ from __future__ import annotations
 import json
 import os
 from datetime import datetime, timedelta
+from functools import lru_cache
 from pathlib import Path
 from typing import Any
 
@@ -31,13 +32,19 @@ SIGNAL_COOLDOWN_MIN = int(os.getenv('AUTO_SIGNAL_COOLDOWN_MIN', '180') or 180)
 TOP_N_SIGNALS = int(os.getenv('AUTO_SIGNAL_TOP_N', '2') or 2)
 
 
-def _now_local() -> datetime:
+@lru_cache(maxsize=1)
+def _local_tz():
     if ZoneInfo is None:
-        return datetime.now()
+        return None
     try:
-        return datetime.now(ZoneInfo(TIMEZONE))
+        return ZoneInfo(TIMEZONE)
     except Exception:
-        return datetime.now()
+        return None
+
+
+def _now_local() -> datetime:
+    tz = _local_tz()
+    return datetime.now(tz) if tz is not None else datetime.now()
 
 
 def _load_json(path: Path) -> dict[str, Any]:
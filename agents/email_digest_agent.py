@@ -6,6 +6,7 @@ import os
 import re
 import urllib.parse
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
 from typing import Any, Iterable
 from xml.etree import ElementTree as ET
@@ -32,13 +33,19 @@ MACRO_STATE_PATH = Path("data/macro_calendar_state.json")
 RISK_ENGINE_PATH = Path("data/risk_engine_state.json")
 
 
-def _now_local() -> datetime:
+@lru_cache(maxsize=1)
+def _local_tz():
     if ZoneInfo is None:
-        return datetime.now()
+        return None
     try:
-        return datetime.now(ZoneInfo(TIMEZONE))
+        return ZoneInfo(TIMEZONE)
     except Exception:
-        return datetime.now()
+        return None
+
+
+def _now_local() -> datetime:
+    tz = _local_tz()
+    return datetime.now(tz) if tz is not None else datetime.now()
 
 
 def _load_state() -> dict[str, Any]:
@@ -5,6 +5,7 @@ import json
 import math
 import os
 from datetime import datetime, timedelta
+from functools import lru_cache
 from pathlib import Path
 from typing import Any
 
@@ -31,13 +32,19 @@ ALERT_WINDOW_END_HOUR = int(os.getenv("ALERT_WINDOW_END_HOUR", "21"))
 DAILY_MAX_PER_SYMBOL = int(os.getenv("PORTFOLIO_ALERT_DAILY_MAX_PER_SYMBOL", "2"))
 
 
-def _now_local() -> datetime:
+@lru_cache(maxsize=1)
+def _local_tz():
     if ZoneInfo is None:
-        return datetime.now()
+        return None
     try:
-        return datetime.now(ZoneInfo(TIMEZONE))
+        return ZoneInfo(TIMEZONE)
     except Exception:
-        return datetime.now()
+        return None
+
+
+def _now_local() -> datetime:
+    tz = _local_tz()
+    return datetime.now(tz) if tz is not None else datetime.now()
 
 
 def _load_state() -> dict[str, Any]:
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import json
 from datetime import datetime, timedelta
+from functools import lru_cache
 from pathlib import Path
 from typing import Any
 
@@ -16,13 +17,19 @@ STATE_RETENTION_DAYS = 30
 JSONL_KEEP_LINES = 4000
 
 
-def _now_local() -> datetime:
+@lru_cache(maxsize=1)
+def _local_tz():
     if ZoneInfo is None:
-        return datetime.now()
+        return None
     try:
-        return datetime.now(ZoneInfo(TIMEZONE))
+        return ZoneInfo(TIMEZONE)
     except Exception:
-        return datetime.now()
+        return None
+
+
+def _now_local() -> datetime:
+    tz = _local_tz()
+    return datetime.now(tz) if tz is not None else datetime.now()
 
 
 def _prune_state_mapping(path: Path, key_name: str, date_field: str) -> tuple[int, int]:
@@ -14,7 +14,7 @@ from radar.engine import (
 )
 
 from reporting.telegram import telegram_send_long
-from reporting.telegram import telegram_send_photo
+from reporting.telegram import telegram_send_photo, telegram_send_media_group
 from reporting.emailer import maybe_send_email_report
 from reporting.pretty_charts import PortfolioRow, render_portfolio_table, render_radar_bars
 from reporting.formatters import (
@@ -91,8 +91,9 @@ def main():
         text = format_premarket_report(snapshot, cfg)
         telegram_send_long(cfg, text)
 
-        # Vizuální výstupy (PNG) – portfolio + radar TOP
+        # Vizuální výstupy (PNG) – portfolio + radar TOP, odeslané jedním albem
         if bool(getattr(cfg, "send_charts", False)):
+            photos = []
             try:
                 rows = []
                 for p in (cfg.portfolio or []):
@@ -107,7 +108,7 @@ def main():
                 if rows:
                     out = "/tmp/portfolio.png"
                     render_portfolio_table(rows, out_path=out, title="Portfolio – 1D")
-                    telegram_send_photo(cfg, out, caption="📊 *Portfolio (1D změna)*")
+                    photos.append((out, "📊 *Portfolio (1D změna)*"))
 
                 top = snapshot.get("top") or []
                 scores = {
@@ -118,9 +119,11 @@ def main():
                 if scores:
                     out2 = "/tmp/radar_top.png"
                     render_radar_bars(scores, out_path=out2, title="Radar – TOP")
-                    telegram_send_photo(cfg, out2, caption="🔥 *Radar – TOP (score)*")
+                    photos.append((out2, "🔥 *Radar – TOP (score)*"))
             except Exception as e:
                 print("Chart render/send error:", e)
+            # co se stihlo vyrenderovat, odejde i při chybě u dalšího grafu
+            telegram_send_media_group(cfg, photos)
 
         # Email max 1× denně (primárně z ranního reportu)
         maybe_send_email_report(cfg, snapshot, now, tag="premarket")
@@ -1,9 +1,23 @@
 # radar/agent.py
 from __future__ import annotations
 
+import atexit
+import io
+import json
+import os
+import queue
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+try:
+    import orjson
+except Exception:
+    orjson = None
 
 from radar.config import RadarConfig
 from radar.engine import (
@@ -19,6 +33,182 @@ from radar.engine import (
 )
 from radar.state import State
 
+# TTL (s) pro in-memory cache síťových fetchů; opakovaný explain nemusí znovu tahat RSS/Yahoo
+NEWS_CACHE_TTL_S = 300.0
+QUOTE_CACHE_TTL_S = 60.0
+REGIME_CACHE_TTL_S = 60.0
+# TTL (s) hotových odpovědí těžkých příkazů; opakované ťuknutí = odpověď z paměti
+# (snapshot/alerts mají v klíči minutu -> TTL nad 60 s by nikdy nezabral)
+RESPONSE_CACHE_TTL_S = {"snapshot": 60.0, "alerts": 30.0, "earnings": 3600.0}
+# LRU strop počtu položek v cache agenta
+CACHE_MAX_ENTRIES = 256
+
+# max bajtů zapsaných audit writerem jedním os.write (snapshot záznamy umí být velké)
+AUDIT_BATCH_MAX_BYTES = 256 * 1024
+# rotace audit logu: agent_log.jsonl -> .1 -> ... -> .N (nejstarší se zahodí)
+AUDIT_MAX_BYTES = 5_000_000
+AUDIT_BACKUP_COUNT = 5
+
+
+HELP_MD = """## Radar Agent — příkazy
+
+- `snapshot` … kompletní radar top/worst
+- `alerts` … intradenní alerty (od open)
+- `earnings` … earnings tabulka na týden
+- `explain TICKER` … co se děje + proč + co hlídat
+- `add TICKER` … přidá do watchlistu
+- `remove TICKER` … odebere z watchlistu
+- `add portfolio TICKER qty=10 avg=123.45` … přidá do portfolia
+- `remove portfolio TICKER` … smaže z portfolia
+- `portfolio` … ukáže portfolio
+- `watchlist` … ukáže watchlist
+- `weights` … ukáže váhy skóre
+
+Tip: když napíšeš jen `AAPL`, vezmu to jako `explain AAPL`.
+"""
+
+# řádky akční interpretace (explain)
+_NOTE_NO_DATA = "- Nemám spolehlivá 1D data → ber to jako informativní."
+_NOTE_MOVE_BIG = "- **Velký pohyb**: typicky news/earnings/sector move → ověř headline a kontext (pre/after-market)."
+_NOTE_MOVE_STRONG = "- **Výrazný pohyb**: často katalyzátor + momentum → sleduj další den (follow-through vs mean-reversion)."
+_NOTE_MOVE_NORMAL = "- **Běžný pohyb**: signál může být spíš o trendu/market režimu než o jedné zprávě."
+_NOTE_VOL_HIGH = "- **Objem je nadprůměrný** → pohyb má větší „váhu“ (méně náhodný)."
+_NOTE_VOL_LOW = "- **Objem je slabý** → pohyb může být „thin“ (méně důvěryhodný)."
+_NOTE_NEWS = "- **Jsou zprávy** → validuj hlavně *earnings/guidance/downgrade/regulace/kontrakty*."
+_NOTE_NO_NEWS = "- **Bez jasných zpráv** → často trh/ETF flow/technika (support/resistance)."
+_EXPLAIN_NO_NEWS = "### Zprávy\n- Nic jasného v RSS – často je to sentiment/technika/trh."
+_NOTE_REGIME = {
+    "RISK-OFF": "- **RISK-OFF režim** → vyšší pravděpodobnost výplachů, hlídej korelace a drawdown.",
+    "RISK-ON": "- **RISK-ON režim** → momentum má vyšší šanci pokračovat, ale pozor na falešné breaky.",
+}
+_EARNINGS_TABLE_HEAD = "| Datum | Čas | Symbol | Firma | EPS est | Rev est |\n|---|---|---|---|---:|---:|\n"
+_NO_ALERTS = "- Nic nepřekročilo práh."
+_NO_EARNINGS = "- Nic z univerza v kalendáři."
+
+
+# numpy skaláry z engine a ne-str klíče nemají padat do pomalého stdlib fallbacku
+_ORJSON_OPTS = (
+    orjson.OPT_APPEND_NEWLINE | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+    if orjson is not None
+    else 0
+)
+
+
+def _jsonl_line(record: Dict[str, Any]) -> bytes:
+    """JSONL řádek jako bytes (orjson, pokud je k dispozici; jinak stdlib json).
+
+    Nikdy nevyhazuje: nezapsatelný záznam vrátí b"" (audit writer nesmí spadnout).
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(record, option=_ORJSON_OPTS)
+        except TypeError:
+            pass
+    try:
+        return (json.dumps(record, ensure_ascii=False, default=str) + "\n").encode("utf-8")
+    except Exception:
+        return b""
+
+
+class _AuditWriter:
+    """Writer vlákno + O_APPEND fd pro jeden audit log; sdílí ho všichni agenti se stejnou cestou.
+
+    Nedrží referenci na agenta -> agent jde normálně uvolnit, vlákno je jedno na soubor.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.q: "queue.Queue[Dict[str, Any]]" = queue.Queue()
+        self._fd: Optional[int] = None  # otevře se líně při prvním zápisu
+        self._size = 0
+        self._thread = threading.Thread(target=self._run, name="radar-audit", daemon=True)
+        self._thread.start()
+
+    def put(self, record: Dict[str, Any]) -> None:
+        self.q.put(record)
+
+    def _run(self) -> None:
+        q = self.q
+        while True:
+            lines = [_jsonl_line(q.get())]
+            size = len(lines[0])
+            # přibal, co už čeká ve frontě, dokud batch nepřeroste limit
+            while size < AUDIT_BATCH_MAX_BYTES:
+                try:
+                    line = _jsonl_line(q.get_nowait())
+                except queue.Empty:
+                    break
+                lines.append(line)
+                size += len(line)
+            self._write(b"".join(lines))
+            for _ in lines:
+                q.task_done()
+
+    def _open(self) -> None:
+        self._fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        self._size = os.fstat(self._fd).st_size
+
+    def _write(self, payload: bytes) -> None:
+        try:
+            if self._fd is None:
+                os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+                self._open()
+            # celý batch jedním syscallem; O_APPEND zajistí atomický append
+            try:
+                os.write(self._fd, payload)
+            except OSError:
+                # fd zavřený/neplatný (např. externí rotace) -> jednou znovu otevřít
+                self.close()
+                self._open()
+                os.write(self._fd, payload)
+            self._size += len(payload)
+            if self._size >= AUDIT_MAX_BYTES:
+                self._rotate()
+        except Exception:
+            pass
+
+    def close(self) -> None:
+        fd, self._fd = self._fd, None
+        if fd is not None:
+            try:
+                os.close(fd)
+            except OSError:
+                pass
+
+    def _rotate(self) -> None:
+        self.close()
+        path = self.path
+        for i in range(AUDIT_BACKUP_COUNT - 1, 0, -1):
+            src = f"{path}.{i}"
+            if os.path.exists(src):
+                os.replace(src, f"{path}.{i + 1}")
+        os.replace(path, f"{path}.1")
+
+
+# cesta -> writer; jeden atexit hook pro všechny (registruje se s prvním writerem)
+_AUDIT_WRITERS: Dict[str, _AuditWriter] = {}
+_AUDIT_WRITERS_LOCK = threading.Lock()
+
+
+def _audit_writer(path: str) -> _AuditWriter:
+    path = os.path.abspath(path)
+    with _AUDIT_WRITERS_LOCK:
+        w = _AUDIT_WRITERS.get(path)
+        if w is None:
+            if not _AUDIT_WRITERS:
+                atexit.register(_close_audit_writers)
+            w = _AUDIT_WRITERS[path] = _AuditWriter(path)
+    return w
+
+
+def _close_audit_writers() -> None:
+    # při exitu: nech writery vyprázdnit frontu, pak zavři fd
+    with _AUDIT_WRITERS_LOCK:
+        writers = list(_AUDIT_WRITERS.values())
+    for w in writers:
+        w.q.join()
+        w.close()
+
 
 @dataclass
 class AgentResponse:
@@ -36,85 +226,144 @@ class RadarAgent:
     - audit log do .state/agent_log.jsonl (append-only)
     """
 
+    # příkaz -> jméno handleru; handler má jednotnou signaturu (now, args)
+    _DISPATCH: Dict[str, str] = {
+        "help": "_cmd_help",
+        "?": "_cmd_help",
+        "snapshot": "_cmd_snapshot",
+        "alerts": "_cmd_alerts",
+        "earnings": "_cmd_earnings",
+        "explain": "_cmd_explain",
+        "add": "_cmd_add",
+        "remove": "_cmd_remove",
+        "portfolio": "_cmd_portfolio",
+        "watchlist": "_cmd_watchlist",
+        "weights": "_cmd_weights",
+    }
+
     def __init__(self, cfg: RadarConfig, st: Optional[State] = None):
         self.cfg = cfg
         self.st = st or State(cfg.state_dir)
+        # set zrcadlo watchlistu pro O(1) membership (list drží pořadí pro výpis)
+        self._watch_set = set(cfg.watchlist)
+        # ticker -> řádky portfolia (remove bez upper() přes každý řádek)
+        self._portfolio_by_ticker: Dict[str, List[Dict[str, Any]]] = {}
+        for r in cfg.portfolio:
+            self._portfolio_by_ticker.setdefault(str(r.get("ticker", "")).upper(), []).append(r)
+        # (fetch, args...) -> (monotonic expirace, value)
+        self._cache: "OrderedDict[Tuple[Any, ...], Tuple[float, Any]]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+        # číselné parametry z cfg převedené jednou (ne při každém explain/alerts)
+        self._alert_threshold = float(cfg.alert_threshold_pct)
+        self._news_per_ticker = int(cfg.news_per_ticker or 2)
+        # sdílený pool pro nezávislé síťové fetch (vytvoří se při prvním použití)
+        self._pool: Optional[ThreadPoolExecutor] = None
+        # bound metody postavené jednou -> handle() je jen dict lookup
+        self._dispatch: Dict[str, Callable[[datetime, List[str]], AgentResponse]] = {
+            cmd: getattr(self, name) for cmd, name in self._DISPATCH.items()
+        }
 
     # ----------------- public entry -----------------
     def handle(self, text: str, now: Optional[datetime] = None) -> AgentResponse:
         now = now or datetime.now()
         cmd, args = self._parse(text)
 
-        if cmd in ("help", "?"):
-            return self._help()
+        handler = self._dispatch.get(cmd)
+        if handler is not None:
+            return handler(now, args)
 
-        if cmd == "snapshot":
-            return self.snapshot(now=now, reason="manual")
+        # fallback: když user napíše jen ticker, ber to jako explain
+        if cmd and cmd.isalpha() and 1 <= len(cmd) <= 10 and not args:
+            return self.explain(ticker=cmd, now=now)
 
-        if cmd == "alerts":
-            return self.alerts(now=now)
+        return AgentResponse("Neznámý příkaz", f"Neznámý příkaz: `{text}`\n\nNapiš `help`.")
 
-        if cmd == "earnings":
-            return self.earnings(now=now)
+    # ----------------- command handlers (now, args) -----------------
+    def _cmd_help(self, now: datetime, args: List[str]) -> AgentResponse:
+        return self._help()
 
-        if cmd == "explain":
-            if not args:
-                return AgentResponse("Explain", "Použití: `explain TICKER`")
-            return self.explain(ticker=args[0], now=now)
+    def _cmd_snapshot(self, now: datetime, args: List[str]) -> AgentResponse:
+        return self.snapshot(now=now, reason="manual")
 
-        if cmd == "add":
-            if not args:
-                return AgentResponse("Add", "Použití: `add TICKER` nebo `add watch TICKER` nebo `add portfolio TICKER qty=... avg=...`")
-            return self.add(args=args)
+    def _cmd_alerts(self, now: datetime, args: List[str]) -> AgentResponse:
+        return self.alerts(now=now)
 
-        if cmd == "remove":
-            if not args:
-                return AgentResponse("Remove", "Použití: `remove TICKER` nebo `remove watch TICKER` nebo `remove portfolio TICKER`")
-            return self.remove(args=args)
+    def _cmd_earnings(self, now: datetime, args: List[str]) -> AgentResponse:
+        return self.earnings(now=now)
 
-        if cmd == "portfolio":
-            return self.show_portfolio()
+    def _cmd_explain(self, now: datetime, args: List[str]) -> AgentResponse:
+        if not args:
+            return AgentResponse("Explain", "Použití: `explain TICKER`")
+        return self.explain(ticker=args[0], now=now)
 
-        if cmd == "watchlist":
-            return self.show_watchlist()
+    def _cmd_add(self, now: datetime, args: List[str]) -> AgentResponse:
+        if not args:
+            return AgentResponse("Add", "Použití: `add TICKER` nebo `add watch TICKER` nebo `add portfolio TICKER qty=... avg=...`")
+        return self.add(args=args)
 
-        if cmd == "weights":
-            return self.show_weights()
+    def _cmd_remove(self, now: datetime, args: List[str]) -> AgentResponse:
+        if not args:
+            return AgentResponse("Remove", "Použití: `remove TICKER` nebo `remove watch TICKER` nebo `remove portfolio TICKER`")
+        return self.remove(args=args)
 
-        # fallback: když user napíše jen ticker, ber to jako explain
-        if cmd and cmd.isalpha() and 1 <= len(cmd) <= 10 and not args:
-            return self.explain(ticker=cmd, now=now)
+    def _cmd_portfolio(self, now: datetime, args: List[str]) -> AgentResponse:
+        return self.show_portfolio()
 
-        return AgentResponse("Neznámý příkaz", f"Neznámý příkaz: `{text}`\n\nNapiš `help`.")
+    def _cmd_watchlist(self, now: datetime, args: List[str]) -> AgentResponse:
+        return self.show_watchlist()
+
+    def _cmd_weights(self, now: datetime, args: List[str]) -> AgentResponse:
+        return self.show_weights()
 
     # ----------------- core actions -----------------
-    def snapshot(self, now: datetime, reason: str = "snapshot") -> AgentResponse:
+    # klíč odpovědi nese i `now` (minuta, u earnings den = začátek okna from..to):
+    # jiný čas volajícího nesmí dostat odpověď vyrenderovanou pro starší okamžik
+    def snapshot(self, now: datetime, reason: str = "snapshot", force: bool = False) -> AgentResponse:
+        key = ("resp", "snapshot", reason, now.replace(second=0, microsecond=0))
+        return self._cached(key, RESPONSE_CACHE_TTL_S["snapshot"], lambda: self._snapshot(now, reason), force=force)
+
+    def alerts(self, now: datetime, force: bool = False) -> AgentResponse:
+        key = ("resp", "alerts", now.replace(second=0, microsecond=0))
+        return self._cached(key, RESPONSE_CACHE_TTL_S["alerts"], lambda: self._alerts(now), force=force)
+
+    def earnings(self, now: datetime, force: bool = False) -> AgentResponse:
+        key = ("resp", "earnings", now.date())
+        return self._cached(key, RESPONSE_CACHE_TTL_S["earnings"], lambda: self._earnings(now), force=force)
+
+    def _snapshot(self, now: datetime, reason: str) -> AgentResponse:
         snap = run_radar_snapshot(cfg=self.cfg, now=now, reason=reason, universe=None, st=self.st)
         md = self._format_snapshot(snap)
-        self._audit("snapshot", {"reason": reason, "meta": snap.get("meta", {}), "top": snap.get("top", [])})
-        self.st.save()
+        self._audit("snapshot", {"reason": reason, "meta": snap.get("meta", {}), "top": snap.get("top", [])}, now=now)
+        self.st.mark_dirty()
         return AgentResponse("Radar snapshot", md, payload=snap)
 
-    def alerts(self, now: datetime) -> AgentResponse:
+    def _alerts(self, now: datetime) -> AgentResponse:
         alerts = run_alerts_snapshot(cfg=self.cfg, now=now, st=self.st)
         md = self._format_alerts(alerts, now=now)
-        self._audit("alerts", {"count": len(alerts), "alerts": alerts})
-        self.st.save()
+        self._audit("alerts", {"count": len(alerts), "alerts": alerts}, now=now)
+        self.st.mark_dirty()
         return AgentResponse("Alerty", md, payload={"alerts": alerts})
 
-    def earnings(self, now: datetime) -> AgentResponse:
+    def _earnings(self, now: datetime) -> AgentResponse:
         table = run_weekly_earnings_table(cfg=self.cfg, now=now, st=self.st)
         md = self._format_earnings(table)
-        self._audit("earnings", {"meta": table.get("meta", {}), "count": len(table.get("rows", []))})
-        self.st.save()
+        self._audit("earnings", {"meta": table.get("meta", {}), "count": len(table.get("rows", []))}, now=now)
+        self.st.mark_dirty()
         return AgentResponse("Earnings týden", md, payload=table)
 
     def explain(self, ticker: str, now: datetime) -> AgentResponse:
         raw = ticker.strip().upper()
         resolved = map_ticker(self.cfg, raw)
-        regime_label, regime_detail, _ = market_regime(self.cfg)
 
-        lc = last_close_prev_close(resolved)
+        # 4 nezávislé I/O fetch paralelně -> latence ~ max(...) místo sum(...)
+        ex = self._executor()
+        f_regime = ex.submit(self._regime)
+        f_lc = ex.submit(self._last_close, resolved)
+        f_vr = ex.submit(self._volume_ratio, resolved)
+        f_news = ex.submit(self._news, resolved, self._news_per_ticker)
+
+        regime_label, regime_detail, _ = f_regime.result()
+        lc = f_lc.result()
         pct_1d = None
         last = prev = None
         if lc:
@@ -122,38 +371,30 @@ class RadarAgent:
             if prev:
                 pct_1d = ((last - prev) / prev) * 100.0
 
-        vol_ratio = volume_ratio_1d(resolved)
-        news = news_combined(resolved, int(self.cfg.news_per_ticker or 2))
+        vol_ratio = f_vr.result()
+        news = f_news.result()
         why = why_from_headlines(news)
 
-        md: List[str] = []
-        md.append(f"## {raw} ({resolved})")
-        md.append(f"- **Tržní režim:** **{regime_label}** — {regime_detail}")
-        if last is not None and prev is not None:
-            md.append(f"- **Close:** {last:.4g} (předtím {prev:.4g})")
-        if pct_1d is None:
-            md.append("- **Změna 1D:** nedostupné")
-        else:
-            md.append(f"- **Změna 1D:** **{pct_1d:+.2f}%**")
-        md.append(f"- **Objem vs průměr (20D):** **{vol_ratio:.2f}×**")
-
-        md.append("\n### Co to znamená (akčně)")
-        md.append(self._actionable_interpretation(pct_1d=pct_1d, vol_ratio=vol_ratio, has_news=bool(news), regime=regime_label))
-
-        md.append("\n### Proč se to hýbe (z headline)")
-        md.append(f"- {why}")
-
+        close_line = f"- **Close:** {last:.4g} (předtím {prev:.4g})\n" if last is not None and prev is not None else ""
+        pct_txt = "nedostupné" if pct_1d is None else f"**{pct_1d:+.2f}%**"
+        interpretation = self._actionable_interpretation(pct_1d=pct_1d, vol_ratio=vol_ratio, has_news=bool(news), regime=regime_label)
         if news:
-            md.append("\n### Top zprávy")
-            for src, title, url in news[: min(6, len(news))]:
-                md.append(f"- **{src}**: [{title}]({url})")
+            news_block = "### Top zprávy\n" + "\n".join(f"- **{src}**: [{title}]({url})" for src, title, url in news[:6])
         else:
-            md.append("\n### Zprávy")
-            md.append("- Nic jasného v RSS – často je to sentiment/technika/trh.")
-
-        out = "\n".join(md)
-        self._audit("explain", {"ticker": raw, "resolved": resolved, "pct_1d": pct_1d, "vol_ratio": vol_ratio, "news_n": len(news)})
-        self.st.save()
+            news_block = _EXPLAIN_NO_NEWS
+
+        out = (
+            f"## {raw} ({resolved})\n"
+            f"- **Tržní režim:** **{regime_label}** — {regime_detail}\n"
+            f"{close_line}"
+            f"- **Změna 1D:** {pct_txt}\n"
+            f"- **Objem vs průměr (20D):** **{vol_ratio:.2f}×**\n"
+            f"\n### Co to znamená (akčně)\n{interpretation}\n"
+            f"\n### Proč se to hýbe (z headline)\n- {why}\n"
+            f"\n{news_block}"
+        )
+        self._audit("explain", {"ticker": raw, "resolved": resolved, "pct_1d": pct_1d, "vol_ratio": vol_ratio, "news_n": len(news)}, now=now)
+        self.st.mark_dirty()
         return AgentResponse(f"Explain {raw}", out)
 
     # ----------------- config editing (in-memory) -----------------
@@ -172,8 +413,10 @@ class RadarAgent:
 
         t = rest[0].strip().upper()
         if mode == "watch":
-            if t not in self.cfg.watchlist:
+            if t not in self._watch_set:
+                self._watch_set.add(t)
                 self.cfg.watchlist.append(t)
+                self._invalidate_cache()
             return AgentResponse("Watchlist", f"Přidáno do watchlistu: **{t}**\n\nTeď máš: `{', '.join(self.cfg.watchlist)}`")
 
         row: Dict[str, Any] = {"ticker": t}
@@ -182,6 +425,8 @@ class RadarAgent:
                 k, v = part.split("=", 1)
                 row[k.strip()] = v.strip()
         self.cfg.portfolio.append(row)
+        self._portfolio_by_ticker.setdefault(t, []).append(row)
+        self._invalidate_cache()
         return AgentResponse("Portfolio", f"Přidáno do portfolia: **{t}**\n\nZáznam: `{row}`")
 
     def remove(self, args: List[str]) -> AgentResponse:
@@ -196,13 +441,18 @@ class RadarAgent:
 
         t = rest[0].strip().upper()
         if mode == "watch":
-            self.cfg.watchlist = [x for x in self.cfg.watchlist if x != t]
+            if t in self._watch_set:
+                self._watch_set.discard(t)
+                self.cfg.watchlist = [x for x in self.cfg.watchlist if x != t]
+                self._invalidate_cache()
             return AgentResponse("Watchlist", f"Odebráno z watchlistu: **{t}**\n\nTeď máš: `{', '.join(self.cfg.watchlist)}`")
 
-        before = len(self.cfg.portfolio)
-        self.cfg.portfolio = [r for r in self.cfg.portfolio if str(r.get("ticker", "")).upper() != t]
-        after = len(self.cfg.portfolio)
-        return AgentResponse("Portfolio", f"Odebráno z portfolia: **{t}** (smazáno {before - after} záznamů)")
+        bucket = self._portfolio_by_ticker.pop(t, [])
+        if bucket:
+            drop = {id(r) for r in bucket}
+            self.cfg.portfolio = [r for r in self.cfg.portfolio if id(r) not in drop]
+            self._invalidate_cache()
+        return AgentResponse("Portfolio", f"Odebráno z portfolia: **{t}** (smazáno {len(bucket)} záznamů)")
 
     def show_portfolio(self) -> AgentResponse:
         """Pretty portfolio snapshot (Telegram-friendly)."""
@@ -291,143 +541,159 @@ class RadarAgent:
         lines.append(f"\nSoučet: **{s:.3f}**")
         return AgentResponse("Weights", "\n".join(lines))
 
+    # ----------------- cached fetch -----------------
+    def _executor(self) -> ThreadPoolExecutor:
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="radar-agent")
+        return self._pool
+
+    def _cached(self, key: Tuple[Any, ...], ttl: float, producer: Callable[[], Any], force: bool = False) -> Any:
+        ts = time.monotonic()
+        if not force:
+            with self._cache_lock:
+                hit = self._cache.get(key)
+                if hit is not None and ts < hit[0]:
+                    self._cache.move_to_end(key)
+                    return hit[1]
+        val = producer()
+        if val is not None:  # neúspěšný fetch necachujeme
+            with self._cache_lock:
+                # zápis = miss po síťovém fetchi -> projít ≤256 položek a zahodit prošlé je levné
+                cache = self._cache
+                for k in [k for k, (exp, _) in cache.items() if exp <= ts]:
+                    del cache[k]
+                cache[key] = (ts + ttl, val)
+                cache.move_to_end(key)
+                while len(cache) > CACHE_MAX_ENTRIES:
+                    cache.popitem(last=False)
+        return val
+
+    def _invalidate_cache(self) -> None:
+        # změna univerza (add/remove) -> další dotazy jdou na čerstvá data
+        with self._cache_lock:
+            self._cache.clear()
+
+    def _regime(self) -> Tuple[str, str, float]:
+        return self._cached(("regime",), REGIME_CACHE_TTL_S, lambda: market_regime(self.cfg))
+
+    def _news(self, resolved: str, n: int) -> List[Tuple[str, str, str]]:
+        return self._cached(("news", resolved, n), NEWS_CACHE_TTL_S, lambda: news_combined(resolved, n))
+
+    def _last_close(self, resolved: str) -> Optional[Tuple[float, float]]:
+        return self._cached(("last_close", resolved), QUOTE_CACHE_TTL_S, lambda: last_close_prev_close(resolved))
+
+    def _volume_ratio(self, resolved: str) -> float:
+        return self._cached(("volume_ratio", resolved), QUOTE_CACHE_TTL_S, lambda: volume_ratio_1d(resolved))
+
     # ----------------- helpers -----------------
     def _parse(self, text: str) -> Tuple[str, List[str]]:
-        t = (text or "").strip()
-        if not t:
+        # maxsplit=1: oddělí jen příkaz, zbytek se tokenizuje až když něco obsahuje
+        parts = (text or "").split(None, 1)
+        if not parts:
             return "help", []
-        parts = t.split()
-        cmd = parts[0].lower()
-        args = parts[1:]
-        return cmd, args
+        return parts[0].lower(), (parts[1].split() if len(parts) > 1 else [])
 
     def _help(self) -> AgentResponse:
-        md = """## Radar Agent — příkazy
-
-- `snapshot` … kompletní radar top/worst
-- `alerts` … intradenní alerty (od open)
-- `earnings` … earnings tabulka na týden
-- `explain TICKER` … co se děje + proč + co hlídat
-- `add TICKER` … přidá do watchlistu
-- `remove TICKER` … odebere z watchlistu
-- `add portfolio TICKER qty=10 avg=123.45` … přidá do portfolia
-- `remove portfolio TICKER` … smaže z portfolia
-- `portfolio` … ukáže portfolio
-- `watchlist` … ukáže watchlist
-- `weights` … ukáže váhy skóre
-
-Tip: když napíšeš jen `AAPL`, vezmu to jako `explain AAPL`.
-"""
-        return AgentResponse("Help", md)
+        return AgentResponse("Help", HELP_MD)
 
     def _format_snapshot(self, snap: Dict[str, Any]) -> str:
         meta = snap.get("meta", {})
         regime = (meta.get("market_regime") or {})
-        lines: List[str] = []
-        lines.append(f"## Radar snapshot ({meta.get('timestamp','')})")
-        lines.append(f"- Režim: **{regime.get('label','?')}** — {regime.get('detail','')}")
-        lines.append("")
-
         top = snap.get("top", []) or []
         worst = snap.get("worst", []) or []
 
-        lines.append("### TOP")
-        if not top:
-            lines.append("- (prázdné)")
-        for r in top:
-            lines.append(self._fmt_row(r))
-
-        lines.append("\n### WORST")
-        if not worst:
-            lines.append("- (prázdné)")
-        for r in worst:
-            lines.append(self._fmt_row(r))
-
-        return "\n".join(lines)
-
-    def _fmt_row(self, r: Dict[str, Any]) -> str:
-        t = r.get("ticker", "?")
-        c = r.get("company", "—")
-        pct_1d = r.get("pct_1d", None)
-        sc = r.get("score", 0.0)
-        why = r.get("why", "")
-        pct_txt = "n/a" if pct_1d is None else f"{pct_1d:+.2f}%"
-        lvl = r.get("level", "")
-        return f"- **{t}** ({c}) — **{pct_txt}**, score **{sc:.1f}**, level **{lvl}**\n  - proč: {why}"
+        # jeden rostoucí buffer místo listu řádků + join (nižší peak paměti u velkých snapshotů)
+        buf = io.StringIO()
+        w = buf.write
+        w(f"## Radar snapshot ({meta.get('timestamp','')})\n")
+        w(f"- Režim: **{regime.get('label','?')}** — {regime.get('detail','')}\n\n")
+
+        fmt = self._fmt_row
+        w("### TOP\n")
+        w("\n".join(map(fmt, top)) if top else "- (prázdné)")
+
+        w("\n\n### WORST\n")
+        w("\n".join(map(fmt, worst)) if worst else "- (prázdné)")
+
+        return buf.getvalue()
+
+    @staticmethod
+    def _fmt_row(r: Dict[str, Any], _f=float) -> str:
+        # jeden f-string, float předvázaný jako default (lokální lookup místo globálního)
+        g = r.get
+        p = g("pct_1d")
+        pct_txt = "n/a" if p is None else f"{_f(p):+.2f}%"
+        return (
+            f"- **{g('ticker', '?')}** ({g('company', '—')}) — **{pct_txt}**, "
+            f"score **{_f(g('score') or 0.0):.1f}**, level **{g('level', '')}**\n  - proč: {g('why', '')}"
+        )
 
     def _format_alerts(self, alerts: List[Dict[str, Any]], now: datetime) -> str:
-        lines = [f"## Alerty ({now.strftime('%Y-%m-%d %H:%M')})", ""]
+        head = f"## Alerty ({now.isoformat(' ', 'minutes')[:16]})\n\n"
         if not alerts:
-            lines.append("- Nic nepřekročilo práh.")
-            return "\n".join(lines)
+            return head + _NO_ALERTS
+
+        body = "\n".join(self._alert_row(a) for a in alerts)
+        return f"{head}Prahová změna od open: **±{self._alert_threshold:.1f}%**\n\n{body}"
 
-        lines.append(f"Prahová změna od open: **±{float(self.cfg.alert_threshold_pct):.1f}%**\n")
-        for a in alerts:
-            t = a.get("ticker", "?")
-            c = a.get("company", "—")
-            ch = float(a.get("pct_from_open", 0.0))
-            lines.append(f"- **{t}** ({c}) — **{ch:+.2f}%** (open {a.get('open')}, last {a.get('last')})")
-        return "\n".join(lines)
+    @staticmethod
+    def _alert_row(a: Dict[str, Any]) -> str:
+        g = a.get
+        ch = float(g("pct_from_open") or 0.0)
+        return f"- **{g('ticker', '?')}** ({g('company', '—')}) — **{ch:+.2f}%** (open {g('open')}, last {g('last')})"
 
     def _format_earnings(self, table: Dict[str, Any]) -> str:
         meta = table.get("meta", {})
         rows = table.get("rows", []) or []
-        lines = [f"## Earnings ({meta.get('from','')} → {meta.get('to','')})", ""]
+        head = f"## Earnings ({meta.get('from','')} → {meta.get('to','')})\n\n"
         if not rows:
-            lines.append("- Nic z univerza v kalendáři.")
-            return "\n".join(lines)
+            return head + _NO_EARNINGS
+
+        body = "\n".join(self._earnings_row(r) for r in rows)
+        return f"{head}{_EARNINGS_TABLE_HEAD}{body}"
 
-        lines.append("| Datum | Čas | Symbol | Firma | EPS est | Rev est |")
-        lines.append("|---|---|---|---|---:|---:|")
-        for r in rows:
-            lines.append(
-                f"| {r.get('date','')} | {r.get('time','')} | **{r.get('symbol','')}** | {r.get('company','—')} | {r.get('eps_est','')} | {r.get('rev_est','')} |"
-            )
-        return "\n".join(lines)
+    @staticmethod
+    def _earnings_row(r: Dict[str, Any]) -> str:
+        g = r.get
+        d, tm, sym, co = g("date", ""), g("time", ""), g("symbol", ""), g("company", "—")
+        eps, rev = g("eps_est", ""), g("rev_est", "")
+        return f"| {d} | {tm} | **{sym}** | {co} | {eps} | {rev} |"
 
     def _actionable_interpretation(self, pct_1d: Optional[float], vol_ratio: float, has_news: bool, regime: str) -> str:
         notes: List[str] = []
 
         if pct_1d is None:
-            notes.append("- Nemám spolehlivá 1D data → ber to jako informativní.")
+            notes.append(_NOTE_NO_DATA)
         else:
-            if abs(pct_1d) >= 6:
-                notes.append("- **Velký pohyb**: typicky news/earnings/sector move → ověř headline a kontext (pre/after-market).")
-            elif abs(pct_1d) >= 3:
-                notes.append("- **Výrazný pohyb**: často katalyzátor + momentum → sleduj další den (follow-through vs mean-reversion).")
+            move = abs(pct_1d)
+            if move >= 6:
+                notes.append(_NOTE_MOVE_BIG)
+            elif move >= 3:
+                notes.append(_NOTE_MOVE_STRONG)
             else:
-                notes.append("- **Běžný pohyb**: signál může být spíš o trendu/market režimu než o jedné zprávě.")
+                notes.append(_NOTE_MOVE_NORMAL)
 
         if vol_ratio >= 1.8:
-            notes.append("- **Objem je nadprůměrný** → pohyb má větší „váhu“ (méně náhodný).")
+            notes.append(_NOTE_VOL_HIGH)
         elif vol_ratio <= 0.7:
-            notes.append("- **Objem je slabý** → pohyb může být „thin“ (méně důvěryhodný).")
+            notes.append(_NOTE_VOL_LOW)
 
-        if has_news:
-            notes.append("- **Jsou zprávy** → validuj hlavně *earnings/guidance/downgrade/regulace/kontrakty*.")
-        else:
-            notes.append("- **Bez jasných zpráv** → často trh/ETF flow/technika (support/resistance).")
+        notes.append(_NOTE_NEWS if has_news else _NOTE_NO_NEWS)
 
-        if regime == "RISK-OFF":
-            notes.append("- **RISK-OFF režim** → vyšší pravděpodobnost výplachů, hlídej korelace a drawdown.")
-        elif regime == "RISK-ON":
-            notes.append("- **RISK-ON režim** → momentum má vyšší šanci pokračovat, ale pozor na falešné breaky.")
+        regime_note = _NOTE_REGIME.get(regime)
+        if regime_note:
+            notes.append(regime_note)
 
         return "\n".join(notes)
 
-    def _audit(self, event: str, data: Dict[str, Any]) -> None:
-        import os
-        import json
-
-        os.makedirs(self.cfg.state_dir, exist_ok=True)
-        path = os.path.join(self.cfg.state_dir, "agent_log.jsonl")
+    def _audit(self, event: str, data: Dict[str, Any], now: datetime) -> None:
+        # čas příkazu z handle() -> konzistentní ts bez dalšího datetime.now()
         record = {
-            "ts": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "ts": now.isoformat(" ", "seconds")[:19],
             "event": event,
             "data": data,
         }
-        try:
-            with open(path, "a", encoding="utf-8") as f:
-                f.write(json.dumps(record, ensure_ascii=False) + "\n")
-        except Exception:
-            pass
+        _audit_writer(self._audit_path()).put(record)
+
+    def _audit_path(self) -> str:
+        return os.path.join(self.cfg.state_dir, "agent_log.jsonl")
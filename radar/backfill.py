@@ -2,14 +2,23 @@
 from __future__ import annotations
 
 import os
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from typing import Dict, Any, List, Optional
 
 import yfinance as yf
 
+try:
+    import pyarrow  # noqa: F401  (engine pro DataFrame.to_parquet)
+except Exception:
+    pyarrow = None
+
 from radar.config import RadarConfig
 from radar.universe import resolved_universe
 
+# kolik tickerů se stahuje souběžně (síťové I/O)
+BACKFILL_WORKERS = 8
+
 
 def _to_iso_end(end_iso: str, now: datetime) -> str:
     end_iso = (end_iso or "").strip()
@@ -18,15 +27,64 @@ def _to_iso_end(end_iso: str, now: datetime) -> str:
     return end_iso
 
 
+def _download_one(t: str, start_iso: str, end_iso: str):
+    # yf.download drží globální stav (shared._DFS) a není bezpečný pro souběh z více vláken,
+    # Ticker.history(actions=False) vrací stejné OHLCV sloupce bez sdíleného stavu
+    try:
+        return yf.Ticker(t).history(
+            start=start_iso,
+            end=end_iso,
+            interval="1d",
+            auto_adjust=False,
+            actions=False,
+        )
+    except Exception:
+        return None
+
+
+def _download_bulk(tickers: List[str], start_iso: str, end_iso: str) -> Optional[List[Any]]:
+    """Jeden multi-ticker yf.download; vrací DataFrame (nebo None) pro každý ticker v pořadí, None = selhal celý."""
+    try:
+        big = yf.download(
+            tickers=" ".join(tickers),
+            start=start_iso,
+            end=end_iso,
+            interval="1d",
+            group_by="ticker",
+            progress=False,
+            auto_adjust=False,
+            threads=True,
+        )
+    except Exception:
+        return None
+    if big is None or big.empty:
+        return None
+
+    multi = getattr(big.columns, "nlevels", 1) > 1
+    if not multi and len(tickers) > 1:
+        return None
+    present = set(big.columns.get_level_values(0)) if multi else set(tickers)
+
+    out: List[Any] = []
+    for t in tickers:
+        if t not in present:
+            out.append(None)
+            continue
+        # společný index přes všechny tickery -> odstranit dny, kdy daný ticker nemá data
+        sub = big[t] if multi else big
+        out.append(sub.dropna(how="all"))
+    return out
+
+
 def backfill_history(cfg: RadarConfig, now: datetime, st=None, start_iso: str = "2025-01-01", end_iso: str = "") -> Dict[str, Any]:
     """
     (2) Backfill:
     - stáhne daily data pro resolved tickery
-    - uloží CSV do {state_dir}/history/{ticker}.csv
+    - uloží Parquet do {state_dir}/history/{ticker}.parquet (bez pyarrow CSV {ticker}.csv)
     """
     end_iso = _to_iso_end(end_iso, now)
 
-    state_dir = getattr(cfg, "state_dir", ".state") or ".state"
+    state_dir = cfg.state_dir or ".state"
     history_dir = os.path.join(state_dir, "history")
     os.makedirs(history_dir, exist_ok=True)
 
@@ -37,26 +95,43 @@ def backfill_history(cfg: RadarConfig, now: datetime, st=None, start_iso: str =
     failed: List[str] = []
 
     # Limit: max 60 tickerů na jeden backfill run, ať to nevyteče
-    for t in resolved[:60]:
+    batch = resolved[:60]
+    frames: List[Any] = []
+    if batch:
+        frames = _download_bulk(batch, start_iso, end_iso)
+        if frames is None:
+            # bulk selhal celý -> po jednom, paralelně
+            with ThreadPoolExecutor(max_workers=min(BACKFILL_WORKERS, len(batch))) as ex:
+                frames = list(ex.map(lambda t: _download_one(t, start_iso, end_iso), batch))
+
+    def _write(item) -> bool:
+        t, df = item
         try:
-            df = yf.download(
-                t,
-                start=start_iso,
-                end=end_iso,
-                interval="1d",
-                progress=False,
-                auto_adjust=False,
-                threads=False,
-            )
             if df is None or df.empty:
-                fail += 1
-                failed.append(t)
-                continue
+                return False
+            base = os.path.join(history_dir, t)
+            if pyarrow is not None:
+                # sloupcově + zstd: menší soubory a rychlejší zpětné čtení než CSV
+                try:
+                    df.to_parquet(f"{base}.parquet", engine="pyarrow", compression="zstd")
+                    return True
+                except Exception:
+                    pass
+            df.to_csv(f"{base}.csv")
+            return True
+        except Exception:
+            return False
+
+    # zápisy paralelně (pandas/pyarrow writer uvolňuje GIL); výsledky v pořadí tickerů
+    written: List[bool] = []
+    if batch:
+        with ThreadPoolExecutor(max_workers=min(BACKFILL_WORKERS, len(batch))) as ex:
+            written = list(ex.map(_write, zip(batch, frames)))
 
-            path = os.path.join(history_dir, f"{t}.csv")
-            df.to_csv(path)
+    for t, wrote in zip(batch, written):
+        if wrote:
             ok += 1
-        except Exception:
+        else:
             fail += 1
             failed.append(t)
 
@@ -3,15 +3,18 @@ from __future__ import annotations
 
 import os
 from dataclasses import dataclass, field
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Tuple
 
 try:
     import yaml
+    # LibYAML (C parser), pokud je PyYAML s ním sestavený; jinak čistě pythonový SafeLoader
+    _SafeLoader = getattr(yaml, "CSafeLoader", None) or yaml.SafeLoader
 except Exception:
     yaml = None
+    _SafeLoader = None
 
 
-@dataclass
+@dataclass(slots=True)
 class RadarConfig:
     # core
     timezone: str = "Europe/Prague"
@@ -56,56 +59,81 @@ class RadarConfig:
     ticker_map: Dict[str, str] = field(default_factory=dict)
 
 
+# (abspath, mtime_ns, size) -> naparsovaný YAML; drží se jen poslední verze souboru
+_YAML_CACHE: Dict[Tuple[str, int, int], Dict[str, Any]] = {}
+
+
 def _load_yaml() -> Dict[str, Any]:
     if yaml is None:
         return {}
     for p in ("config.yml", "config.yaml"):
-        if os.path.exists(p):
+        try:
+            st = os.stat(p)
+        except OSError:
+            continue
+        # opakované load_config() v jednom procesu neparsuje YAML znovu, dokud se soubor nezmění
+        key = (os.path.abspath(p), st.st_mtime_ns, st.st_size)
+        raw = _YAML_CACHE.get(key)
+        if raw is None:
             try:
                 with open(p, "r", encoding="utf-8") as f:
-                    return yaml.safe_load(f) or {}
+                    raw = yaml.load(f, Loader=_SafeLoader) or {}
             except Exception:
                 return {}
+            _YAML_CACHE.clear()
+            _YAML_CACHE[key] = raw
+        return raw
     return {}
 
 
-def _as_list_str(x) -> List[str]:
+def _as_upper_list(x) -> List[str]:
+    # strip + upper v jednom průchodu, prázdné položky vypadnou
     if not isinstance(x, list):
         return []
-    out = []
-    for it in x:
-        s = str(it).strip()
-        if s:
-            out.append(s)
-    return out
+    return [u for u in (str(it).strip().upper() for it in x) if u]
+
+
+def _cfg_str(raw: Dict[str, Any], key: str, default: str) -> str:
+    v = raw.get(key)
+    if v is None:
+        return default
+    return (v if isinstance(v, str) else str(v)).strip() or default
+
+
+def _cfg_num(raw: Dict[str, Any], key: str, default, cast):
+    # prázdná/nulová/nečíselná hodnota -> default (dřív `or default` + výjimka u nesmyslu)
+    v = raw.get(key)
+    if not v:
+        return default
+    try:
+        return cast(v)
+    except Exception:
+        return default
 
 
 def load_config() -> RadarConfig:
     raw = _load_yaml()
     cfg = RadarConfig()
 
-    cfg.timezone = str(raw.get("timezone", cfg.timezone)).strip()
-    cfg.state_dir = str(raw.get("state_dir", cfg.state_dir)).strip()
+    cfg.timezone = _cfg_str(raw, "timezone", cfg.timezone)
+    cfg.state_dir = _cfg_str(raw, "state_dir", cfg.state_dir)
 
-    cfg.premarket_time = str(raw.get("premarket_time", cfg.premarket_time)).strip()
-    cfg.evening_time = str(raw.get("evening_time", cfg.evening_time)).strip()
-    cfg.alert_start = str(raw.get("alert_start", cfg.alert_start)).strip()
-    cfg.alert_end = str(raw.get("alert_end", cfg.alert_end)).strip()
-    cfg.weekly_earnings_time = str(raw.get("weekly_earnings_time", cfg.weekly_earnings_time)).strip()
+    cfg.premarket_time = _cfg_str(raw, "premarket_time", cfg.premarket_time)
+    cfg.evening_time = _cfg_str(raw, "evening_time", cfg.evening_time)
+    cfg.alert_start = _cfg_str(raw, "alert_start", cfg.alert_start)
+    cfg.alert_end = _cfg_str(raw, "alert_end", cfg.alert_end)
+    cfg.weekly_earnings_time = _cfg_str(raw, "weekly_earnings_time", cfg.weekly_earnings_time)
 
-    cfg.alert_threshold_pct = float(raw.get("alert_threshold_pct", cfg.alert_threshold_pct) or cfg.alert_threshold_pct)
-    cfg.news_per_ticker = int(raw.get("news_per_ticker", cfg.news_per_ticker) or cfg.news_per_ticker)
-    cfg.top_n = int(raw.get("top_n", cfg.top_n) or cfg.top_n)
+    cfg.alert_threshold_pct = _cfg_num(raw, "alert_threshold_pct", cfg.alert_threshold_pct, float)
+    cfg.news_per_ticker = _cfg_num(raw, "news_per_ticker", cfg.news_per_ticker, int)
+    cfg.top_n = _cfg_num(raw, "top_n", cfg.top_n, int)
 
     # intraday settings
-    cfg.alert_interval = str(raw.get("alert_interval", raw.get("timeframe", cfg.alert_interval)) or cfg.alert_interval).strip()
-    try:
-        cfg.max_alerts_per_day = int(raw.get("max_alerts_per_day", cfg.max_alerts_per_day) or cfg.max_alerts_per_day)
-    except Exception:
-        cfg.max_alerts_per_day = cfg.max_alerts_per_day
+    cfg.alert_interval = _cfg_str(raw, "alert_interval", _cfg_str(raw, "timeframe", cfg.alert_interval))
+    cfg.max_alerts_per_day = _cfg_num(raw, "max_alerts_per_day", cfg.max_alerts_per_day, int)
 
     # FMP key: yaml -> env override (podpora obou názvů secretů)
-    cfg.fmp_api_key = str(raw.get("fmp_api_key", "") or "").strip()
+    cfg.fmp_api_key = _cfg_str(raw, "fmp_api_key", "")
     cfg.fmp_api_key = (os.getenv("FMPAPIKEY") or os.getenv("FMP_API_KEY") or cfg.fmp_api_key).strip()
 
     if isinstance(raw.get("benchmarks"), dict):
@@ -135,8 +163,8 @@ def load_config() -> RadarConfig:
                 out.append(r)
         cfg.portfolio = out
 
-    cfg.watchlist = [s.strip().upper() for s in _as_list_str(raw.get("watchlist", cfg.watchlist))]
-    cfg.new_candidates = [s.strip().upper() for s in _as_list_str(raw.get("new_candidates", []))]
+    cfg.watchlist = _as_upper_list(raw.get("watchlist", cfg.watchlist))
+    cfg.new_candidates = _as_upper_list(raw.get("new_candidates", []))
 
     tm = raw.get("ticker_map", {})
     if isinstance(tm, dict):
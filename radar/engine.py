@@ -2,6 +2,7 @@
 from __future__ import annotations
 
 import math
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from typing import Any, Dict, List, Optional, Tuple
 
@@ -156,18 +157,23 @@ def _rss_entries(url: str, limit: int) -> List[Tuple[str, str]]:
         return []
 
 
-def news_combined(yahoo_ticker: str, limit_each: int) -> List[Tuple[str, str, str]]:
-    items: List[Tuple[str, str, str]] = []
+# sdílený pool pro RSS feedy; volá se i z workerů snapshotu, proto samostatný (žádný deadlock)
+NEWS_FEED_WORKERS = 12
+_FEED_POOL = ThreadPoolExecutor(max_workers=NEWS_FEED_WORKERS, thread_name_prefix="radar-rss")
 
-    y = f"https://feeds.finance.yahoo.com/rss/2.0/headline?s={yahoo_ticker}&region=US&lang=en-US"
-    items += [("Yahoo", t, l) for t, l in _rss_entries(y, limit_each)]
 
+def news_combined(yahoo_ticker: str, limit_each: int) -> List[Tuple[str, str, str]]:
+    y = f"https://feeds.finance.yahoo.com/rss/2.0/headline?s={yahoo_ticker}&region=US&lang=en-US"
     sa = f"https://seekingalpha.com/symbol/{yahoo_ticker}.xml"
-    items += [("SeekingAlpha", t, l) for t, l in _rss_entries(sa, limit_each)]
-
     q = requests.utils.quote(f"{yahoo_ticker} stock OR {yahoo_ticker} earnings OR {yahoo_ticker} guidance")
     gn = f"https://news.google.com/rss/search?q={q}&hl=en-US&gl=US&ceid=US:en"
-    items += [("GoogleNews", t, l) for t, l in _rss_entries(gn, limit_each)]
+
+    # tři feedy souběžně (čistě síťové I/O); pořadí zdrojů zůstává Yahoo, SA, Google
+    sources = (("Yahoo", y), ("SeekingAlpha", sa), ("GoogleNews", gn))
+    futs = [(src, _FEED_POOL.submit(_rss_entries, url, limit_each)) for src, url in sources]
+    items: List[Tuple[str, str, str]] = []
+    for src, f in futs:
+        items += [(src, t, l) for t, l in f.result()]
 
     seen = set()
     uniq = []
@@ -195,12 +201,14 @@ WHY_KEYWORDS = [
 def why_from_headlines(news_items: List[Tuple[str, str, str]]) -> str:
     if not news_items:
         return "bez jasné zprávy – může to být sentiment/technika/trh."
-    titles = " ".join([t for (_, t, _) in news_items]).lower()
+    titles = " ".join(t for (_, t, _) in news_items).lower()
     hits = []
     for keys, reason in WHY_KEYWORDS:
         if any(k in titles for k in keys):
             hits.append(reason)
-    return "; ".join(hits[:2]) + "." if hits else "bez jasné zprávy – může to být sentiment/technika/trh."
+            if len(hits) == 2:  # do textu jdou jen první 2 důvody
+                break
+    return "; ".join(hits) + "." if hits else "bez jasné zprávy – může to být sentiment/technika/trh."
 
 
 # ---------- FMP earnings calendar ----------
@@ -288,6 +296,69 @@ def run_weekly_earnings_table(cfg: RadarConfig, now: datetime, st=None) -> Dict[
 
 
 # ---------- Public API ----------
+# kolik tickerů snapshotu se stahuje souběžně (čistě síťové I/O)
+SNAPSHOT_WORKERS = 8
+
+
+def _snapshot_row(
+    cfg: RadarConfig,
+    raw: str,
+    resolved_t: str,
+    regime: Tuple[str, str, float],
+    st=None,
+) -> Dict[str, Any]:
+    regime_label, regime_detail, regime_score = regime
+
+    lc = last_close_prev_close(resolved_t)
+    pct_1d = None
+    if lc:
+        last, prev = lc
+        pct_1d = pct(last, prev)
+
+    momentum = 0.0 if pct_1d is None else min(10.0, (abs(pct_1d) / 8.0) * 10.0)
+    vol_ratio = volume_ratio_1d(resolved_t)
+    news = news_combined(resolved_t, int(cfg.news_per_ticker or 2))
+    why = why_from_headlines(news)
+    catalyst = min(10.0, 1.0 + 0.7 * len(news)) if news else 0.0
+
+    raw_feat = {
+        "pct_1d": pct_1d,
+        "momentum": momentum,
+        "rel_strength": 0.0,
+        "vol_ratio": vol_ratio,
+        "catalyst_score": catalyst,
+        "regime_score": regime_score,
+    }
+
+    feats = compute_features(raw_feat)
+    score = compute_score(feats, cfg.weights)
+
+    lvl_key, lvl_info = pick_level(
+        pct_from_open=None,
+        pct_1d=pct_1d,
+        vol_ratio=vol_ratio,
+        has_catalyst=bool(news),
+        score=score,
+    )
+
+    company = resolve_company_name(resolved_t, st=st)
+
+    return {
+        "ticker": raw,
+        "resolved": resolved_t,
+        "company": company,
+        "pct_1d": pct_1d,
+        "class": movement_class(pct_1d),
+        "score": float(score),
+        "src": "RSS",
+        "why": why,
+        "news": [{"src": s, "title": t, "url": u} for (s, t, u) in news],
+        "market_regime": {"label": regime_label, "detail": regime_detail, "score": regime_score},
+        "level_key": lvl_key,
+        "level": lvl_info["level_label"],
+    }
+
+
 def run_radar_snapshot(
     cfg: RadarConfig,
     now: datetime,
@@ -296,65 +367,22 @@ def run_radar_snapshot(
     st=None,
 ) -> Dict[str, Any]:
     resolved, raw_to_resolved = resolved_universe(cfg, universe=universe)
-    regime_label, regime_detail, regime_score = market_regime(cfg)
+    regime = market_regime(cfg)
+    regime_label, regime_detail, regime_score = regime
 
-    rows: List[Dict[str, Any]] = []
-    for resolved_t in resolved:
-        raw = None
-        for k, v in raw_to_resolved.items():
-            if v == resolved_t:
-                raw = k
-                break
-        raw = raw or resolved_t
-
-        lc = last_close_prev_close(resolved_t)
-        pct_1d = None
-        if lc:
-            last, prev = lc
-            pct_1d = pct(last, prev)
-
-        momentum = 0.0 if pct_1d is None else min(10.0, (abs(pct_1d) / 8.0) * 10.0)
-        vol_ratio = volume_ratio_1d(resolved_t)
-        news = news_combined(resolved_t, int(cfg.news_per_ticker or 2))
-        why = why_from_headlines(news)
-        catalyst = min(10.0, 1.0 + 0.7 * len(news)) if news else 0.0
-
-        raw_feat = {
-            "pct_1d": pct_1d,
-            "momentum": momentum,
-            "rel_strength": 0.0,
-            "vol_ratio": vol_ratio,
-            "catalyst_score": catalyst,
-            "regime_score": regime_score,
-        }
-
-        feats = compute_features(raw_feat)
-        score = compute_score(feats, cfg.weights)
-
-        lvl_key, lvl_info = pick_level(
-            pct_from_open=None,
-            pct_1d=pct_1d,
-            vol_ratio=vol_ratio,
-            has_catalyst=bool(news),
-            score=score,
-        )
+    # resolved -> první raw (dřív lineární hledání pro každý ticker)
+    resolved_to_raw: Dict[str, str] = {}
+    for k, v in raw_to_resolved.items():
+        resolved_to_raw.setdefault(v, k)
 
-        company = resolve_company_name(resolved_t, st=st)
-
-        rows.append({
-            "ticker": raw,
-            "resolved": resolved_t,
-            "company": company,
-            "pct_1d": pct_1d,
-            "class": movement_class(pct_1d),
-            "score": float(score),
-            "src": "RSS",
-            "why": why,
-            "news": [{"src": s, "title": t, "url": u} for (s, t, u) in news],
-            "market_regime": {"label": regime_label, "detail": regime_detail, "score": regime_score},
-            "level_key": lvl_key,
-            "level": lvl_info["level_label"],
-        })
+    # tickery jsou nezávislé -> fetch paralelně, pořadí řádků zachováno (map)
+    rows: List[Dict[str, Any]] = []
+    if resolved:
+        with ThreadPoolExecutor(max_workers=min(SNAPSHOT_WORKERS, len(resolved))) as ex:
+            rows = list(ex.map(
+                lambda rt: _snapshot_row(cfg, resolved_to_raw.get(rt) or rt, rt, regime, st=st),
+                resolved,
+            ))
 
     rows_sorted = sorted(rows, key=lambda r: r.get("score", 0.0), reverse=True)
     top_n = int(cfg.top_n or 5)
@@ -410,12 +438,19 @@ def run_alerts_snapshot(cfg: RadarConfig, now: datetime, st) -> List[Dict[str, A
         if remaining <= 0:
             return []
 
-    for raw_t in sorted(tickers):
+    # intraday open/last pro všechny tickery paralelně (síťové I/O);
+    # stav (dedupe, denní cap) se pak zpracuje sekvenčně ve stejném pořadí
+    ordered = sorted(tickers)
+    resolved_list = [map_ticker(cfg, t) for t in ordered]
+    opens: List[Optional[Tuple[float, float]]] = []
+    if resolved_list:
+        with ThreadPoolExecutor(max_workers=min(SNAPSHOT_WORKERS, len(resolved_list))) as ex:
+            opens = list(ex.map(lambda rt: intraday_open_last(rt, interval=interval), resolved_list))
+
+    for raw_t, resolved_t, ol in zip(ordered, resolved_list, opens):
         if remaining <= 0:
             break
 
-        resolved_t = map_ticker(cfg, raw_t)
-        ol = intraday_open_last(resolved_t, interval=interval)
         if not ol:
             continue
 
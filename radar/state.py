@@ -3,9 +3,24 @@ from __future__ import annotations
 
 import os
 import json
+import atexit
+import threading
+import weakref
 from typing import Dict, Any, Optional
 
 
+# States s neuloženými změnami; jeden atexit hook pro všechny (WeakSet -> State jde uvolnit)
+_DIRTY_STATES: "weakref.WeakSet[State]" = weakref.WeakSet()
+
+
+def _flush_dirty_states() -> None:
+    for st in list(_DIRTY_STATES):
+        st.flush()
+
+
+atexit.register(_flush_dirty_states)
+
+
 class State:
     """
     - sent markers (premarket/evening/weekly_earnings)
@@ -13,6 +28,9 @@ class State:
     - company name cache (yfinance info)
     """
 
+    # okno (s), ve kterém se víc mark_dirty() slije do jednoho save()
+    SAVE_DEBOUNCE_S = 2.0
+
     def __init__(self, state_dir: str = ".state"):
         self.state_dir = state_dir or ".state"
         os.makedirs(self.state_dir, exist_ok=True)
@@ -25,6 +43,11 @@ class State:
         self.alerts: Dict[str, Any] = self._read_json(self.alerts_file, {})
         self.names: Dict[str, str] = self._read_json(self.names_file, {})
 
+        self._dirty = False
+        self._save_timer: Optional[threading.Timer] = None
+        # RLock: flush() drží zámek přes save(), takže počká i na save běžící v timer vlákně
+        self._save_lock = threading.RLock()
+
     def _read_json(self, path: str, default):
         try:
             if os.path.exists(path):
@@ -113,6 +136,39 @@ class State:
 
     # ---- persist ----
     def save(self) -> None:
-        self._write_json(self.sent_file, self.sent)
-        self._write_json(self.alerts_file, self.alerts)
-        self._write_json(self.names_file, self.names)
\ No newline at end of file
+        with self._save_lock:
+            self._dirty = False
+            if self._save_timer is not None:
+                self._save_timer.cancel()
+                self._save_timer = None
+            # mělké kopie: save může běžet z timer vlákna, zatímco hlavní vlákno mění dicty
+            sent, alerts, names = dict(self.sent), dict(self.alerts), dict(self.names)
+            self._write_json(self.sent_file, sent)
+            self._write_json(self.alerts_file, alerts)
+            self._write_json(self.names_file, names)
+            _DIRTY_STATES.discard(self)
+
+    def mark_dirty(self) -> None:
+        """
+        Odložený save: série příkazů během SAVE_DEBOUNCE_S = jeden zápis na disk.
+        """
+        with self._save_lock:
+            self._dirty = True
+            # neuložené změny zapiš i při ukončení procesu
+            _DIRTY_STATES.add(self)
+            if self._save_timer is None:
+                t = threading.Timer(self.SAVE_DEBOUNCE_S, self.flush)
+                t.daemon = True
+                self._save_timer = t
+                t.start()
+
+    def flush(self) -> None:
+        # _dirty se čte pod zámkem: rozběhnutý save() (timer) se nejdřív dokončí,
+        # jinak by atexit skončil dřív a daemon vlákno by useklo json.dump v půlce souboru
+        with self._save_lock:
+            if not self._dirty:
+                return
+            try:
+                self.save()
+            except Exception:
+                pass
@@ -1,8 +1,11 @@
 # reporting/telegram.py
 import requests
-from typing import Optional
+from typing import List, Optional, Tuple
 from radar.config import RadarConfig
 
+# sdílená session = keep-alive spojení na api.telegram.org (TLS handshake jen jednou)
+_SESSION = requests.Session()
+
 
 def _chunk_text(text: str, limit: int = 3500):
     parts, buf = [], ""
@@ -32,7 +35,7 @@ def telegram_send_long(cfg: RadarConfig, text: str):
     url = f"https://api.telegram.org/bot{token}/sendMessage"
     for part in _chunk_text(text):
         try:
-            r = requests.post(
+            r = _SESSION.post(
                 url,
                 data={"chat_id": chat_id, "text": part, "disable_web_page_preview": True},
                 timeout=35,
@@ -66,8 +69,62 @@ def telegram_send_photo(cfg: RadarConfig, photo_path: str, caption: Optional[str
     try:
         with open(photo_path, "rb") as f:
             files = {"photo": f}
-            r = requests.post(url, data=data, files=files, timeout=45)
+            r = _SESSION.post(url, data=data, files=files, timeout=45)
             if r.status_code != 200:
                 print("Telegram photo odpověď:", r.status_code, r.text[:400])
     except Exception as e:
-        print("Telegram photo error:", e)
\ No newline at end of file
+        print("Telegram photo error:", e)
+
+
+def telegram_send_media_group(cfg: RadarConfig, items: List[Tuple[str, Optional[str]]]):
+    """Send several photos (path, caption) as one Telegram album (sendMediaGroup, 2–10 items)."""
+    if not items:
+        return
+    if len(items) == 1:
+        telegram_send_photo(cfg, items[0][0], caption=items[0][1])
+        return
+
+    token = (getattr(cfg, "telegram_token", "") or "").strip()
+    chat_id = (getattr(cfg, "telegram_chat_id", "") or "").strip()
+
+    import json
+    import os
+
+    token = (os.getenv("TELEGRAMTOKEN") or os.getenv("TG_BOT_TOKEN") or token).strip()
+    chat_id = (os.getenv("CHATID") or os.getenv("TG_CHAT_ID") or chat_id).strip()
+
+    if not token or not chat_id:
+        print("⚠️ Telegram není nastaven: chybí token/chat_id.")
+        return
+
+    url = f"https://api.telegram.org/bot{token}/sendMediaGroup"
+    # jeden request místo N× sendPhoto; Telegram bere 2–10 položek na album,
+    # takže N rozdělíme rovnoměrně (např. 11 -> 6+5, ne 10+1)
+    n_albums = -(-len(items) // 10)
+    base, extra = divmod(len(items), n_albums)
+    start = 0
+    for k in range(n_albums):
+        chunk = items[start:start + base + (1 if k < extra else 0)]
+        start += len(chunk)
+        media, files = [], {}
+        try:
+            for i, (photo_path, caption) in enumerate(chunk):
+                name = f"photo{i}"
+                with open(photo_path, "rb") as f:
+                    files[name] = (os.path.basename(photo_path), f.read())
+                m = {"type": "photo", "media": f"attach://{name}"}
+                if caption:
+                    m["caption"] = caption
+                    m["parse_mode"] = "Markdown"
+                media.append(m)
+
+            r = _SESSION.post(
+                url,
+                data={"chat_id": chat_id, "media": json.dumps(media, ensure_ascii=False)},
+                files=files,
+                timeout=60,
+            )
+            if r.status_code != 200:
+                print("Telegram album odpověď:", r.status_code, r.text[:400])
+        except Exception as e:
+            print("Telegram album error:", e)
@@ -0,0 +1,209 @@
+import gc
+import json
+import os
+import tempfile
+import threading
+import unittest
+import weakref
+from datetime import datetime
+from unittest import mock
+
+from radar.config import RadarConfig
+from radar import state as state_mod
+from radar.state import State
+
+try:
+    from radar import agent as agent_mod
+except ImportError:  # yfinance/feedparser/requests nejsou nainstalované
+    agent_mod = None
+
+
+class StateDebounceTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.st = State(self.tmp.name)
+
+    def test_mark_dirty_coalesces_into_one_save(self):
+        self.st.SAVE_DEBOUNCE_S = 0.05
+        with mock.patch.object(self.st, "save", wraps=self.st.save) as save:
+            for i in range(5):
+                self.st.mark_sent(f"tag{i}", "2026-01-05")
+                self.st.mark_dirty()
+            timer = self.st._save_timer
+            timer.join(2.0)
+
+        self.assertEqual(save.call_count, 1)
+        self.assertIsNone(self.st._save_timer)
+        with open(self.st.sent_file, encoding="utf-8") as f:
+            self.assertEqual(len(json.load(f)), 5)
+
+    def test_flush_writes_pending_changes(self):
+        # flush je atexit hook: musí zapsat i to, na co timer ještě nedoběhl
+        self.st.SAVE_DEBOUNCE_S = 60.0
+        self.st.mark_sent("premarket", "2026-01-05")
+        self.st.mark_dirty()
+        self.st.flush()
+
+        self.assertIsNone(self.st._save_timer)
+        with open(self.st.sent_file, encoding="utf-8") as f:
+            self.assertEqual(json.load(f), {"premarket": "2026-01-05"})
+
+    def test_flush_without_changes_does_not_write(self):
+        self.st.flush()
+        self.assertFalse(os.path.exists(self.st.sent_file))
+
+    def test_flush_waits_for_running_save(self):
+        # save() už shodil _dirty a zapisuje -> flush (atexit) musí počkat, ne hned skončit
+        writing, release = threading.Event(), threading.Event()
+        real_write = self.st._write_json
+
+        def slow_write(path, data):
+            writing.set()
+            release.wait(2.0)
+            real_write(path, data)
+
+        self.st.mark_sent("premarket", "2026-01-05")
+        self.st._dirty = True
+        with mock.patch.object(self.st, "_write_json", side_effect=slow_write):
+            saver = threading.Thread(target=self.st.save)
+            saver.start()
+            writing.wait(2.0)
+            threading.Timer(0.05, release.set).start()
+            self.st.flush()
+            # po návratu flush už musí být dopsaný i poslední soubor
+            done = os.path.exists(self.st.names_file)
+            saver.join(2.0)
+
+        self.assertTrue(done)
+
+    def test_exit_hook_flushes_dirty_states(self):
+        self.st.SAVE_DEBOUNCE_S = 60.0
+        self.st.mark_sent("evening", "2026-01-05")
+        self.st.mark_dirty()
+        state_mod._flush_dirty_states()
+
+        self.assertNotIn(self.st, state_mod._DIRTY_STATES)
+        with open(self.st.sent_file, encoding="utf-8") as f:
+            self.assertEqual(json.load(f), {"evening": "2026-01-05"})
+
+    def test_state_is_collectable(self):
+        st = State(self.tmp.name)
+        st.SAVE_DEBOUNCE_S = 60.0
+        st.mark_dirty()
+        st.flush()
+        ref = weakref.ref(st)
+        del st
+        gc.collect()
+        self.assertIsNone(ref())
+
+
+@unittest.skipIf(agent_mod is None, "radar.agent deps (yfinance/feedparser/requests) missing")
+class AgentTestCase(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.cfg = RadarConfig(state_dir=self.tmp.name, watchlist=["SPY"])
+        self.st = State(self.tmp.name)
+        self.agent = agent_mod.RadarAgent(self.cfg, self.st)
+
+
+class ResponseCacheNowTest(AgentTestCase):
+    def test_alerts_different_minute_is_recomputed(self):
+        with mock.patch.object(agent_mod, "run_alerts_snapshot", return_value=[]) as run:
+            first = self.agent.handle("alerts", now=datetime(2026, 1, 5, 10, 0))
+            second = self.agent.handle("alerts", now=datetime(2026, 3, 9, 15, 30))
+
+        self.assertEqual(run.call_count, 2)
+        self.assertIn("2026-01-05 10:00", first.markdown)
+        self.assertIn("2026-03-09 15:30", second.markdown)
+
+    def test_alerts_same_minute_is_cached(self):
+        with mock.patch.object(agent_mod, "run_alerts_snapshot", return_value=[]) as run:
+            first = self.agent.handle("alerts", now=datetime(2026, 1, 5, 10, 0, 5))
+            second = self.agent.handle("alerts", now=datetime(2026, 1, 5, 10, 0, 40))
+
+        self.assertEqual(run.call_count, 1)
+        self.assertIs(first, second)
+
+    def test_earnings_next_day_is_recomputed(self):
+        table = {"meta": {"from": "a", "to": "b"}, "rows": []}
+        with mock.patch.object(agent_mod, "run_weekly_earnings_table", return_value=table) as run:
+            self.agent.handle("earnings", now=datetime(2026, 1, 4, 23, 59))
+            self.agent.handle("earnings", now=datetime(2026, 1, 4, 23, 59, 30))
+            self.agent.handle("earnings", now=datetime(2026, 1, 5, 0, 1))
+
+        self.assertEqual(run.call_count, 2)
+
+
+class ResponseCacheTest(AgentTestCase):
+    NOW = datetime(2026, 1, 5, 10, 0)
+
+    def test_alerts_expire_after_ttl(self):
+        ttl = agent_mod.RESPONSE_CACHE_TTL_S["alerts"]
+        ticks = [100.0, 100.0 + ttl - 1, 100.0 + ttl + 1]
+        with mock.patch.object(agent_mod, "run_alerts_snapshot", return_value=[]) as run, \
+                mock.patch.object(agent_mod.time, "monotonic", side_effect=ticks):
+            for _ in ticks:
+                self.agent.handle("alerts", now=self.NOW)
+
+        self.assertEqual(run.call_count, 2)
+
+    def test_expired_entries_are_dropped_on_write(self):
+        ticks = [100.0, 200.0]
+        with mock.patch.object(agent_mod, "run_alerts_snapshot", return_value=[]), \
+                mock.patch.object(agent_mod.time, "monotonic", side_effect=ticks):
+            self.agent.handle("alerts", now=datetime(2026, 1, 5, 10, 0))
+            self.agent.handle("alerts", now=datetime(2026, 1, 5, 10, 1))
+
+        self.assertEqual(list(self.agent._cache), [("resp", "alerts", datetime(2026, 1, 5, 10, 1))])
+
+    def test_add_and_remove_invalidate(self):
+        with mock.patch.object(agent_mod, "run_alerts_snapshot", return_value=[]) as run:
+            self.agent.handle("alerts", now=self.NOW)
+            self.agent.handle("alerts", now=self.NOW)
+            self.assertEqual(run.call_count, 1)
+
+            self.agent.handle("add AAPL")
+            self.agent.handle("alerts", now=self.NOW)
+            self.assertEqual(run.call_count, 2)
+
+            self.agent.handle("remove AAPL")
+            self.agent.handle("alerts", now=self.NOW)
+            self.assertEqual(run.call_count, 3)
+
+            # add už sledovaného tickeru univerzum nemění -> cache zůstává
+            self.agent.handle("add SPY")
+            self.agent.handle("alerts", now=self.NOW)
+            self.assertEqual(run.call_count, 3)
+
+
+class AuditLogTest(AgentTestCase):
+    NOW = datetime(2026, 1, 5, 10, 0)
+
+    def test_rotation_keeps_backup_count(self):
+        path = self.agent._audit_path()
+        writer = agent_mod._audit_writer(path)
+        with mock.patch.object(agent_mod, "AUDIT_MAX_BYTES", 1):
+            # po jednom záznamu (join) -> každý zápis překročí limit a zrotuje
+            for i in range(agent_mod.AUDIT_BACKUP_COUNT + 2):
+                self.agent._audit("test", {"i": i}, now=self.NOW)
+                writer.q.join()
+
+        n = agent_mod.AUDIT_BACKUP_COUNT
+        for i in range(1, n + 1):
+            self.assertTrue(os.path.exists(f"{path}.{i}"), i)
+        self.assertFalse(os.path.exists(f"{path}.{n + 1}"))
+        with open(f"{path}.1", encoding="utf-8") as f:
+            self.assertEqual(json.loads(f.read())["data"], {"i": n + 1})
+
+    def test_agents_share_one_writer_per_path(self):
+        other = agent_mod.RadarAgent(self.cfg, self.st)
+        self.assertIs(
+            agent_mod._audit_writer(self.agent._audit_path()),
+            agent_mod._audit_writer(other._audit_path()),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
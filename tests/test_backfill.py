@@ -0,0 +1,85 @@
+import os
+import tempfile
+import unittest
+from datetime import datetime
+from unittest import mock
+
+from radar.config import RadarConfig
+
+try:
+    import pandas as pd
+    from radar import backfill as backfill_mod
+except ImportError:  # pandas/yfinance nejsou nainstalované
+    pd = None
+    backfill_mod = None
+
+NAN = float("nan")
+
+
+def _bulk_frame():
+    # tvar yf.download(group_by="ticker"): sloupce (ticker, pole), společný index dnů
+    idx = pd.to_datetime(["2026-01-05", "2026-01-06", "2026-01-07"])
+    cols = pd.MultiIndex.from_product([["AAA", "BBB"], ["Open", "Close"]])
+    return pd.DataFrame(
+        [
+            [1.0, 1.5, NAN, NAN],  # BBB ten den neobchodoval
+            [2.0, 2.5, 20.0, 20.5],
+            [3.0, 3.5, 30.0, 30.5],
+        ],
+        index=idx,
+        columns=cols,
+    )
+
+
+@unittest.skipIf(backfill_mod is None, "pandas/yfinance missing")
+class DownloadBulkTest(unittest.TestCase):
+    def test_multiindex_is_sliced_per_ticker(self):
+        with mock.patch.object(backfill_mod.yf, "download", return_value=_bulk_frame()) as dl:
+            out = backfill_mod._download_bulk(["AAA", "BBB", "CCC"], "2026-01-01", "2026-01-08")
+
+        self.assertEqual(dl.call_count, 1)
+        self.assertEqual(dl.call_args.kwargs["tickers"], "AAA BBB CCC")
+        aaa, bbb, ccc = out
+        self.assertEqual(list(aaa.columns), ["Open", "Close"])
+        self.assertEqual(len(aaa), 3)
+        # řádek jen s NaN (zarovnání na společný index) se zahodí
+        self.assertEqual(list(bbb.index), list(pd.to_datetime(["2026-01-06", "2026-01-07"])))
+        self.assertIsNone(ccc)
+
+    def test_flat_frame_single_ticker(self):
+        flat = _bulk_frame()["AAA"]
+        with mock.patch.object(backfill_mod.yf, "download", return_value=flat):
+            out = backfill_mod._download_bulk(["AAA"], "2026-01-01", "2026-01-08")
+
+        self.assertEqual(len(out), 1)
+        self.assertEqual(len(out[0]), 3)
+
+    def test_flat_frame_for_many_tickers_falls_back(self):
+        flat = _bulk_frame()["AAA"]
+        with mock.patch.object(backfill_mod.yf, "download", return_value=flat):
+            self.assertIsNone(backfill_mod._download_bulk(["AAA", "BBB"], "2026-01-01", "2026-01-08"))
+
+    def test_empty_or_error_falls_back(self):
+        with mock.patch.object(backfill_mod.yf, "download", return_value=pd.DataFrame()):
+            self.assertIsNone(backfill_mod._download_bulk(["AAA"], "2026-01-01", "2026-01-08"))
+        with mock.patch.object(backfill_mod.yf, "download", side_effect=RuntimeError("boom")):
+            self.assertIsNone(backfill_mod._download_bulk(["AAA"], "2026-01-01", "2026-01-08"))
+
+
+@unittest.skipIf(backfill_mod is None, "pandas/yfinance missing")
+class BackfillHistoryTest(unittest.TestCase):
+    def test_missing_ticker_is_reported_as_failed(self):
+        with tempfile.TemporaryDirectory() as d:
+            cfg = RadarConfig(state_dir=d)
+            with mock.patch.object(backfill_mod, "resolved_universe", return_value=(["AAA", "BBB", "CCC"], {})), \
+                    mock.patch.object(backfill_mod, "pyarrow", None), \
+                    mock.patch.object(backfill_mod.yf, "download", return_value=_bulk_frame()):
+                res = backfill_mod.backfill_history(cfg, now=datetime(2026, 1, 8), start_iso="2026-01-01")
+
+            self.assertEqual((res["ok"], res["fail"], res["failed"]), (2, 1, ["CCC"]))
+            self.assertEqual(res["end"], "2026-01-08")
+            self.assertEqual(sorted(os.listdir(res["history_dir"])), ["AAA.csv", "BBB.csv"])
+
+
+if __name__ == "__main__":
+    unittest.main()